@@ -10,6 +10,8 @@ import serial
 import serial.tools.list_ports
 import threading
 import time
+import heapq
+import math
 from datetime import datetime
 from enum import Enum
 
@@ -118,6 +120,11 @@ class MARVTestInterface:
         self.transmitted_packet_count = 0
         self.packet_history = []
 
+        # Scenario scheduler: heap of (deadline, seq, callback) drained by one Tk timer
+        self._sched = []
+        self._sched_seq = 0
+        self._sched_after_id = None
+
         # Create UI
         self.create_widgets()
 
@@ -442,6 +449,7 @@ class MARVTestInterface:
 
     def disconnect(self):
         self.running = False
+        self._sched_cancel_all()
         if self.serial_port:
             self.serial_port.close()
         self.status_label.config(text="Disconnected", foreground="red")
@@ -631,6 +639,45 @@ class MARVTestInterface:
         packet = SCSPacket(create_control_byte(sys_state, SubsystemID.MDPS, ist), dat1, dat0, dec)
         self.send_packet(packet)
 
+    def _sched_push(self, delay, callback):
+        """Schedule a scenario callback to run after delay seconds"""
+        deadline = time.monotonic() + delay
+        self._sched_seq += 1
+        heapq.heappush(self._sched, (deadline, self._sched_seq, callback))
+
+        # Re-arm the timer if this callback is now the earliest one due
+        if self._sched[0][2] is callback:
+            self._sched_arm()
+
+    def _sched_arm(self):
+        """Arm a single Tk timer for the earliest pending deadline"""
+        if self._sched_after_id is not None:
+            self.root.after_cancel(self._sched_after_id)
+            self._sched_after_id = None
+        if self._sched:
+            # Round up so the timer never fires before the deadline (and re-arms with after(0))
+            delay_ms = max(0, math.ceil((self._sched[0][0] - time.monotonic()) * 1000))
+            self._sched_after_id = self.root.after(delay_ms, self._sched_tick)
+
+    def _sched_tick(self):
+        """Run every scenario callback whose deadline has passed"""
+        self._sched_after_id = None
+        now = time.monotonic()
+        try:
+            while self._sched and self._sched[0][0] <= now:
+                _, _, callback = heapq.heappop(self._sched)
+                callback()
+        finally:
+            # Re-arm even if a callback raised, so the callbacks still queued aren't stalled
+            self._sched_arm()
+
+    def _sched_cancel_all(self):
+        """Cancel every pending scenario callback"""
+        self._sched.clear()
+        if self._sched_after_id is not None:
+            self.root.after_cancel(self._sched_after_id)
+            self._sched_after_id = None
+
     def scenario_start_system(self):
         """Scenario: Start the system with touch detection"""
         self.log_all("🚀 SCENARIO: Starting system...")
@@ -656,7 +703,7 @@ class MARVTestInterface:
                 self.log_all(f"   → Sending {name}")
                 func()
                 # Schedule next packet after 1 second
-                self.root.after(1000, lambda: send_next_packet(index + 1))
+                self._sched_push(1.0, lambda: send_next_packet(index + 1))
             else:
                 self.log_all("   ✅ CAL sequence complete - ready for 2nd touch")
 
@@ -690,7 +737,7 @@ class MARVTestInterface:
                 self.log_all(f"   → Sending {name}")
                 func()
                 # Schedule next packet after 800ms
-                self.root.after(800, lambda: send_next_maze_packet(index + 1))
+                self._sched_push(0.8, lambda: send_next_maze_packet(index + 1))
             else:
                 self.log_all("   ✅ MAZE loop complete")
 
@@ -712,8 +759,8 @@ class MARVTestInterface:
             self.log_all("   → Sending second Pure Tone to return to MAZE")
             self.send_snc_packet(3, 0, 1, 0, 0)  # Pure tone in SOS
 
-        self.root.after(2000, send_mdps_response)
-        self.root.after(4000, return_to_maze)
+        self._sched_push(2.0, send_mdps_response)
+        self._sched_push(4.0, return_to_maze)
 
     def send_gpio_command(self, command):
         """Send a GPIO command simulation"""
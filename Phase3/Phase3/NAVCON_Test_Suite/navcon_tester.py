@@ -37,56 +37,172 @@ from tkinter import ttk, messagebox, scrolledtext
 import threading
 import time
 import queue
+import selectors
+import os
 import sys
+import struct
+import functools
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional, Union
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 import json
 
 # ==================== SCS PROTOCOL DEFINITIONS ====================
 
-class SystemState(Enum):
+class SystemState(IntEnum):
     IDLE = 0    # 00
     CAL = 1     # 01
     MAZE = 2    # 10
     SOS = 3     # 11
 
-class SubsystemID(Enum):
+class SubsystemID(IntEnum):
     HUB = 0     # 00
     SNC = 1     # 01
     MDPS = 2    # 10
     SS = 3      # 11
 
+# Enum members compared against every received packet, bound once at module level
+_IDLE, _CAL, _MAZE, _SOS = SystemState.IDLE, SystemState.CAL, SystemState.MAZE, SystemState.SOS
+_SNC = SubsystemID.SNC
+
+# Wire format of one SCS packet: CONTROL | DAT1 | DAT0 | DEC
+PKT_STRUCT = struct.Struct('<BBBB')
+
+# Spacing between the six packets of one MAZE loop iteration (seconds). At 0 the six
+# packets go out as one 24-byte serial write; set it if the SNC UART needs gaps.
+MAZE_TX_INTERVAL = 0.0
+
+# Items held in message_queue until the test thread reads them with get_messages. On
+# overflow the oldest are silently dropped, so a test that stops reading loses its
+# earliest unread packets rather than the newest ones
+MESSAGE_QUEUE_LIMIT = 1024
+
+# Log lines buffered between widget flushes (oldest dropped beyond this; packet_log keeps all)
+LOG_BUFFER_LIMIT = 2048
+
+# Environment variable overriding where save_log writes its files
+LOG_DIR_ENV = "NAVCON_LOG_DIR"
+
+# Default bound on packet_log entries; the raw RX capture keeps as many 4-byte packets
+MAX_LOG_ENTRIES = 200_000
+
+# Display names indexed by the SYS and SUB fields of the control byte
+_SYS_NAMES = ("IDLE", "CAL", "MAZE", "SOS")
+_SUB_NAMES = ("HUB", "SNC", "MDPS", "SS")
+
 @dataclass
 class SCSPacket:
     """SCS Packet Structure: (SYS<1:0> | SUB<1:0> | IST<3:0>) | DAT1 | DAT0 | DEC"""
+    # No per-instance __dict__ (spelled out rather than slots=True to keep Python < 3.10 working)
+    __slots__ = ('control', 'dat1', 'dat0', 'dec')
+
     control: int    # CONTROL<31:24>: SYS<1:0> | SUB<1:0> | IST<3:0>
     dat1: int       # DAT1<23:16>: Upper data byte
     dat0: int       # DAT0<15:8>: Lower data byte
     dec: int        # DEC<7:0>: Decimal/general purpose byte
 
     def __str__(self) -> str:
-        sys_state = (self.control >> 6) & 0x03
-        subsystem = (self.control >> 4) & 0x03
-        ist = self.control & 0x0F
-
-        sys_names = ["IDLE", "CAL", "MAZE", "SOS"]
-        sub_names = ["HUB", "SNC", "MDPS", "SS"]
+        return f"{_CTRL_LABELS[self.control]} || {self.dat1:3} | {self.dat0:3} | {self.dec:3} || {self.control:3}"
 
-        return f"({sys_state}-{subsystem}-{ist}) || {sys_names[sys_state]} | {sub_names[subsystem]} | {ist} || {self.dat1:3} | {self.dat0:3} | {self.dec:3} || {self.control:3}"
+# Control byte layout: SYS in bits 7-6, SUB in bits 5-4, IST in bits 3-0
+SYS_SHIFT = 6
+SUB_SHIFT = 4
+SYS_MASK = 0x03 << SYS_SHIFT
+SUB_MASK = 0x03 << SUB_SHIFT
+IST_MASK = 0x0F
 
+@functools.lru_cache(maxsize=None)  # Only 4 x 4 x 16 distinct inputs
 def create_control_byte(sys_state: SystemState, subsystem: SubsystemID, ist: int) -> int:
     """Create control byte from components"""
-    return (sys_state.value << 6) | (subsystem.value << 4) | (ist & 0x0F)
+    return (sys_state.value << SYS_SHIFT) | (subsystem.value << SUB_SHIFT) | (ist & IST_MASK)
 
 def parse_control_byte(control: int) -> Tuple[SystemState, SubsystemID, int]:
     """Parse control byte into components"""
-    sys_state = SystemState((control >> 6) & 0x03)
-    subsystem = SubsystemID((control >> 4) & 0x03)
-    ist = control & 0x0F
+    sys_state = SystemState((control & SYS_MASK) >> SYS_SHIFT)
+    subsystem = SubsystemID((control & SUB_MASK) >> SUB_SHIFT)
+    ist = control & IST_MASK
     return sys_state, subsystem, ist
 
+# Every possible control byte decoded up front; index with the control byte on the RX path.
+# The entries hold the enum members themselves, so decoded fields can be compared with 'is'
+_CTRL_TABLE = tuple(parse_control_byte(c) for c in range(256))
+
+# The decoded-control part of SCSPacket.__str__, "(SYS-SUB-IST) || NAME | NAME | IST", per control byte
+_CTRL_LABELS = tuple(
+    f"({sys_state}-{subsystem}-{ist}) || {_SYS_NAMES[sys_state]} | {_SUB_NAMES[subsystem]} | {ist}"
+    for sys_state, subsystem, ist in ((c >> SYS_SHIFT, (c & SUB_MASK) >> SUB_SHIFT, c & IST_MASK) for c in range(256))
+)
+
+@functools.lru_cache(maxsize=1024)  # Equal packets share one bytes object
+def pkt(control: int, dat1: int, dat0: int, dec: int) -> bytes:
+    """Build the 4 wire bytes of a packet directly, without an SCSPacket"""
+    return PKT_STRUCT.pack(control, dat1, dat0, dec)
+
+def encode_packet(packet: Union[SCSPacket, bytes]) -> bytes:
+    """Wire bytes of a packet to send; bytes (e.g. from pkt()) are returned unchanged"""
+    if isinstance(packet, bytes):
+        return packet
+    return bytes((packet.control, packet.dat1, packet.dat0, packet.dec))
+
+# Fixed HUB-side packets sent repeatedly by run_test_scenario and the MAZE loop
+PKT_IDLE_HUB_0 = pkt(0, 0, 0, 0)
+PKT_CAL_SS_0 = pkt(112, 0, 0, 0)
+PKT_CAL_MDPS_0 = pkt(96, 10, 10, 0)
+PKT_CAL_MDPS_1 = pkt(97, 90, 0, 0)
+PKT_CAL_SS_1 = pkt(113, 0, 0, 0)
+PKT_MAZE_MDPS_1 = pkt(161, 90, 0, 0)   # Stop/rotate
+PKT_MAZE_MDPS_2 = pkt(162, 0, 0, 0)    # Confirm
+PKT_MAZE_MDPS_3 = pkt(163, 10, 10, 0)  # Forward
+
+# (whole second, "HH:MM:SS") of the last timestamp formatted; replaced as one tuple so
+# the RX, test and GUI threads can share it without a lock
+_ts_second = (None, "")
+
+def _fmt_ts(t: float) -> str:
+    """Format a time.time() value as HH:MM:SS.mmm"""
+    global _ts_second
+    s = int(t)
+    second, hms = _ts_second
+    if s != second:
+        lt = time.localtime(s)
+        hms = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+        _ts_second = (s, hms)
+    return f"{hms}.{int(t * 1000) % 1000:03d}"
+
+def _now_ts() -> str:
+    """Current local time as HH:MM:SS.mmm"""
+    return _fmt_ts(time.time())
+
+class _SentLine:
+    """A SENT log line, formatted only when str() is called on it
+
+    log_message accepts these in place of a string, so lines that are dropped from the
+    display buffer or packet_log before being shown or saved never get formatted.
+    """
+    __slots__ = ('time', 'seq', 'packet', 'description')
+
+    def __init__(self, t: float, seq: int, packet: Union[SCSPacket, bytes], description: str):
+        self.time = t
+        self.seq = seq
+        self.packet = packet
+        self.description = description
+
+    def __str__(self) -> str:
+        packet = self.packet
+        if not isinstance(packet, SCSPacket):
+            packet = SCSPacket(*packet)
+        direction = "SENT"
+        log_line = f"{_fmt_ts(self.time)} || {self.seq:3} || {direction:8} || {packet}"
+        if self.description:
+            log_line += f" || {self.description}"
+        return log_line
+
+def log_directory() -> str:
+    """Directory save_log writes to: $NAVCON_LOG_DIR if set, else the test suite's own folder"""
+    return os.environ.get(LOG_DIR_ENV) or os.path.dirname(os.path.abspath(__file__))
+
 # ==================== NAVCON TEST SCENARIOS ====================
 
 class NAVCONTestScenario:
@@ -95,45 +211,375 @@ class NAVCONTestScenario:
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
-        self.steps = []
-        self.expected_responses = []
 
-    def add_step(self, packet: SCSPacket, description: str, expected_response: Optional[SCSPacket] = None):
+        # Steps as flat columns: 4 raw bytes per step in steps_raw plus a parallel description list
+        self.descriptions = []
+        self._raw_rows = bytearray()
+        self.steps_raw = b""
+
+    def add_step(self, packet: SCSPacket, description: str):
         """Add a test step"""
-        self.steps.append({
-            'packet': packet,
-            'description': description,
-            'expected_response': expected_response
-        })
+        self._append_step(self._encode(packet), description)
+
+    def add_steps(self, rows: Tuple[Tuple[int, int, int, int, str], ...]):
+        """Add steps from (control, dat1, dat0, dec, description) rows"""
+        for control, dat1, dat0, dec, description in rows:
+            self._append_step(pkt(control, dat1, dat0, dec), description)
+
+    @staticmethod
+    def _encode(packet: SCSPacket) -> bytes:
+        """Encode a packet to its 4 wire bytes (shared with every equal packet via pkt())"""
+        return pkt(packet.control & 0xFF, packet.dat1 & 0xFF,
+                   packet.dat0 & 0xFF, packet.dec & 0xFF)
+
+    def _append_step(self, raw: bytes, description: str):
+        """Append one step to the flat columns"""
+        self._raw_rows += raw
+        self.descriptions.append(description)
+
+    def finalize(self):
+        """Freeze the raw step bytes into one immutable buffer"""
+        self.steps_raw = bytes(self._raw_rows)
+
+# ==================== SCENARIO STEP TABLES ====================
+# Each step row is (CONTROL, DAT1, DAT0, DEC, description)
+
+def _repeat_steps(cycle: Tuple[Tuple[int, int, int, int, str], ...], count: int) -> Tuple[Tuple[int, int, int, int, str], ...]:
+    """Repeat a cycle of step rows count times, formatting each description with the 1-based cycle number"""
+    return tuple((control, dat1, dat0, dec, description_fmt.format(i + 1))
+                 for i in range(count)
+                 for control, dat1, dat0, dec, description_fmt in cycle)
+
+# ============================================================
+# QTP1: Initial Calibration and First GREEN Line
+# ============================================================
+QTP1_STEPS = (
+    # IDLE Phase - Initial contact
+    (0, 0, 0, 0, "HUB: Initial contact (IDLE-HUB-0)"),
+
+    # Expect SNC response: (0-1-0) with DAT1=1, DAT0=50
+
+    # CAL Phase - Calibration sequence (simplified - normally 60 seconds)
+    (112, 0, 0, 0, "SS: Start calibration (CAL-SS-0)"),
+    (96, 10, 10, 0, "MDPS: Start calibration (CAL-MDPS-0)"),
+    (97, 90, 0, 0, "MDPS: Calibration rotation 90° (CAL-MDPS-1)"),
+    (113, 0, 0, 0, "SS: Calibration complete (CAL-SS-1)"),
+) + _repeat_steps((
+    # Repeat calibration packets (10 cycles to simulate sustained calibration)
+    (97, 90, 0, 0, "MDPS: Calibration cycle {}"),
+    (113, 0, 0, 0, "SS: Calibration cycle {}"),
+), 10) + (
+
+    # Expect SNC to transition to MAZE: (2-1-1) → (2-1-2) → (2-1-3)
+
+    # MAZE Phase - First GREEN line encounter (angled line, 35°)
+    (161, 90, 0, 0, "MDPS: Stop command (MAZE-MDPS-1)"),
+    (162, 0, 0, 0, "MDPS: Stopped (MAZE-MDPS-2)"),
+    (163, 10, 10, 0, "MDPS: Slow forward (MAZE-MDPS-3)"),
+    (164, 0, 50, 0, "MDPS: Distance 50mm (MAZE-MDPS-4)"),
+
+    # GREEN line S2 detection: Color=2 (GREEN), Angle=35°
+    # Color encoding: S1=0, S2=2, S3=0 → packed = (0<<6)|(2<<3)|(0) = 16 (0x10)
+    (177, 0, 16, 0, "SS: GREEN on S2 (MAZE-SS-1)"),
+    (178, 35, 0, 0, "SS: Incidence angle 35° (MAZE-SS-2)"),
+
+    # Expect SNC to: STOP → REVERSE → STOP → ROTATE
+    # Validate N1.2 compliance: SNC must send (2-1-2) REVERSE before (2-1-1) rotation
+
+    (162, 0, 6, 3, "MDPS: Reverse complete 60mm (MAZE-MDPS-2)"),
+    (161, 90, 0, 0, "MDPS: Stop before rotate (MAZE-MDPS-1)"),
+    (162, 0, 0, 0, "MDPS: Stopped (MAZE-MDPS-2)"),
+
+    # Expect SNC rotation command: (2-1-1) with target angle
+
+    (162, 0, 35, 2, "MDPS: Rotation 35° RIGHT complete (MAZE-MDPS-2)"),
+    (163, 10, 10, 0, "MDPS: Resume forward (MAZE-MDPS-3)"),
+    (177, 0, 0, 0, "SS: All sensors WHITE (MAZE-SS-1)"),
+)
+
+# ============================================================
+# QTP2: Multiple GREEN Lines (Navigable)
+# ============================================================
+QTP2_STEPS = (
+    # Start from active MAZE state
+    (163, 10, 10, 0, "MDPS: Forward movement"),
+    (164, 0, 100, 0, "MDPS: Distance 100mm"),
+
+    # GREEN Line #1: Steep angle (46°) requiring correction
+    (177, 0, 16, 0, "SS: GREEN on S2 (Color=2)"),
+    (178, 46, 0, 0, "SS: Angle 46° (steep)"),
+
+    # Expect: STOP → REVERSE → STOP → ROTATE RIGHT
+    (161, 90, 0, 0, "MDPS: Stop"),
+    (162, 0, 0, 0, "MDPS: Stopped"),
+    (162, 0, 6, 3, "MDPS: Reverse 60mm"),
+    (162, 0, 46, 2, "MDPS: Rotate 46° RIGHT"),
+    (163, 10, 10, 0, "MDPS: Forward"),
+    (177, 0, 0, 0, "SS: WHITE"),
+
+    (164, 0, 150, 0, "MDPS: Distance 150mm"),
+
+    # GREEN Line #2: Small angle (15°) - safe to cross with steering
+    (177, 0, 16, 0, "SS: GREEN on S2"),
+    (178, 15, 0, 0, "SS: Angle 15°"),
+
+    # Expect: STOP → small correction → CROSS
+    (161, 90, 0, 0, "MDPS: Stop"),
+    (162, 0, 10, 2, "MDPS: Small 10° correction"),
+    (163, 10, 10, 1, "MDPS: Crossing line"),
+    (177, 0, 0, 0, "SS: WHITE"),
+
+    (164, 0, 120, 0, "MDPS: Distance 120mm"),
+
+    # GREEN Line #3: Very safe (5°) - direct cross
+    (177, 0, 16, 0, "SS: GREEN on S2"),
+    (178, 5, 0, 0, "SS: Angle 5° (safe)"),
+
+    # Expect: Direct crossing with minimal adjustment
+    (163, 10, 10, 1, "MDPS: Crossing safely"),
+    (177, 0, 0, 0, "SS: WHITE"),
+)
+
+# ============================================================
+# QTP3: BLUE Wall Lines (Must Avoid)
+# ============================================================
+QTP3_STEPS = (
+    (163, 10, 10, 0, "MDPS: Forward"),
+    (164, 0, 80, 0, "MDPS: Distance 80mm"),
+
+    # BLUE Wall #1: 30° angle - RIGHT turn to avoid
+    # Color encoding: S1=0, S2=3 (BLUE), S3=0 → packed = (0<<6)|(3<<3)|(0) = 24 (0x18)
+    (177, 0, 24, 0, "SS: BLUE wall on S2 (Color=3)"),
+    (178, 30, 0, 0, "SS: Angle 30°"),
+
+    # Expect: STOP → REVERSE → STOP → 90° RIGHT turn
+    (161, 90, 0, 0, "MDPS: Stop"),
+    (162, 0, 6, 3, "MDPS: Reverse 60mm"),
+    (162, 0, 90, 2, "MDPS: 90° RIGHT to avoid BLUE"),
+    (163, 10, 10, 0, "MDPS: Forward"),
+    (177, 0, 0, 0, "SS: WHITE"),
+
+    (164, 0, 100, 0, "MDPS: Distance 100mm"),
+
+    # BLUE Wall #2: Steep 52° - RIGHT turn
+    (177, 0, 24, 0, "SS: BLUE wall steep"),
+    (178, 52, 0, 0, "SS: Angle 52°"),
+
+    (161, 90, 0, 0, "MDPS: Stop"),
+    (162, 0, 6, 3, "MDPS: Reverse"),
+    (162, 0, 90, 2, "MDPS: 90° RIGHT"),
+    (163, 10, 10, 0, "MDPS: Forward"),
+    (177, 0, 0, 0, "SS: WHITE"),
+)
+
+# ============================================================
+# QTP4: BLACK Wall Lines (Must Avoid)
+# ============================================================
+QTP4_STEPS = (
+    (163, 10, 10, 0, "MDPS: Forward"),
+    (164, 0, 90, 0, "MDPS: Distance 90mm"),
+
+    # BLACK Wall #1: 28° angle - RIGHT turn
+    # Color encoding: S1=0, S2=4 (BLACK), S3=0 → packed = (0<<6)|(4<<3)|(0) = 32 (0x20)
+    (177, 0, 32, 0, "SS: BLACK wall on S2 (Color=4)"),
+    (178, 28, 0, 0, "SS: Angle 28°"),
+
+    # Expect: STOP → REVERSE → STOP → 90° RIGHT
+    (161, 90, 0, 0, "MDPS: Stop"),
+    (162, 0, 6, 3, "MDPS: Reverse 60mm"),
+    (162, 0, 90, 2, "MDPS: 90° RIGHT to avoid BLACK"),
+    (163, 10, 10, 0, "MDPS: Forward"),
+    (177, 0, 0, 0, "SS: WHITE"),
+
+    (164, 0, 80, 0, "MDPS: Distance 80mm"),
+
+    # BLACK Wall #2: Second BLACK at 35° (triggers 180° logic)
+    (177, 0, 32, 0, "SS: BLACK wall again"),
+    (178, 35, 0, 0, "SS: Angle 35°"),
+
+    # Expect: STOP → REVERSE → 180° turn (90° + 90°)
+    (161, 90, 0, 0, "MDPS: Stop"),
+    (162, 0, 6, 3, "MDPS: Reverse"),
+    (162, 0, 180, 2, "MDPS: 180° turn (second BLACK)"),
+    (163, 10, 10, 0, "MDPS: Forward"),
+    (177, 0, 0, 0, "SS: WHITE"),
+)
+
+# ============================================================
+# QTP5: RED Line (End of Maze)
+# ============================================================
+QTP5_STEPS = (
+    (163, 10, 10, 0, "MDPS: Forward"),
+    (164, 0, 100, 0, "MDPS: Distance 100mm"),
+
+    # RED Line: End of maze marker
+    # Color encoding: S1=1, S2=1, S3=1 (All RED) → packed = (1<<6)|(1<<3)|(1) = 73 (0x49)
+    (177, 0, 73, 0, "SS: RED detected - END OF MAZE (All sensors RED)"),
+    (178, 0, 0, 0, "SS: Angle N/A"),
+
+    # Expect: STOP immediately, no rotation needed
+    (161, 90, 0, 0, "MDPS: Stop"),
+    (162, 0, 0, 0, "MDPS: Stopped at end"),
+
+    # SS signals end of maze with IST=3
+    (179, 0, 0, 0, "SS: End of maze signal (MAZE-SS-3)"),
+
+    # Expect SNC to transition back to IDLE: (0-1-0)
+
+    (0, 0, 0, 0, "System return to IDLE"),
+)
+
+# ============================================================
+# Full Maze: Complete Run Through All Line Types
+# ============================================================
+FULL_MAZE_STEPS = (
+    # Phase 1: Calibration (from QTP1)
+    (0, 0, 0, 0, "HUB: Initial contact"),
+    (112, 0, 0, 0, "SS: Start calibration"),
+    (96, 10, 10, 0, "MDPS: Start calibration"),
+    (97, 90, 0, 0, "MDPS: Rotation calibration"),
+    (113, 0, 0, 0, "SS: Calibration complete"),
+) + _repeat_steps((
+    (97, 90, 0, 0, "CAL cycle {}"),
+    (113, 0, 0, 0, "CAL cycle {}"),
+), 5) + (
+
+    # Phase 2: GREEN lines (navigable)
+    (163, 10, 10, 0, "MAZE: Start forward"),
+    (164, 0, 100, 0, "Distance 100mm"),
+    (177, 0, 16, 0, "GREEN line 1 (35°)"),
+    (178, 35, 0, 0, "Angle 35°"),
+    (161, 90, 0, 0, "Stop"),
+    (162, 0, 6, 3, "Reverse"),
+    (162, 0, 35, 2, "Rotate 35°"),
+    (163, 10, 10, 0, "Forward"),
+    (177, 0, 0, 0, "WHITE"),
+
+    # Phase 3: BLUE wall
+    (164, 0, 120, 0, "Distance 120mm"),
+    (177, 0, 24, 0, "BLUE wall (30°)"),
+    (178, 30, 0, 0, "Angle 30°"),
+    (161, 90, 0, 0, "Stop"),
+    (162, 0, 6, 3, "Reverse"),
+    (162, 0, 90, 2, "90° RIGHT avoid"),
+    (163, 10, 10, 0, "Forward"),
+    (177, 0, 0, 0, "WHITE"),
+
+    # Phase 4: BLACK wall
+    (164, 0, 90, 0, "Distance 90mm"),
+    (177, 0, 32, 0, "BLACK wall (28°)"),
+    (178, 28, 0, 0, "Angle 28°"),
+    (161, 90, 0, 0, "Stop"),
+    (162, 0, 6, 3, "Reverse"),
+    (162, 0, 90, 2, "90° RIGHT avoid"),
+    (163, 10, 10, 0, "Forward"),
+    (177, 0, 0, 0, "WHITE"),
+
+    # Phase 5: Another GREEN
+    (164, 0, 110, 0, "Distance 110mm"),
+    (177, 0, 16, 0, "GREEN line 2 (12°)"),
+    (178, 12, 0, 0, "Angle 12°"),
+    (161, 90, 0, 0, "Stop"),
+    (162, 0, 12, 2, "Small correction"),
+    (163, 10, 10, 1, "Cross line"),
+    (177, 0, 0, 0, "WHITE"),
+
+    # Phase 6: RED end of maze
+    (164, 0, 150, 0, "Distance 150mm"),
+    (177, 0, 73, 0, "RED - END OF MAZE!"),
+    (161, 90, 0, 0, "Final stop"),
+    (162, 0, 0, 0, "Stopped"),
+    (179, 0, 0, 0, "End of maze signal"),
+    (0, 0, 0, 0, "Return to IDLE"),
+)
+
+# (key, name, description, steps) for every predefined scenario, in combo box order
+_SCENARIOS = (
+    ("QTP1", "QTP1: First GREEN Line",
+     "Tests system initialization, calibration, and first GREEN line detection with proper REVERSE behavior.",
+     QTP1_STEPS),
+    ("QTP2", "QTP2: GREEN Lines (Navigable)",
+     "Tests multiple GREEN line encounters with various angles and correction sequences.",
+     QTP2_STEPS),
+    ("QTP3", "QTP3: BLUE Walls",
+     "Tests BLUE wall detection and 90° avoidance turns.",
+     QTP3_STEPS),
+    ("QTP4", "QTP4: BLACK Walls",
+     "Tests BLACK wall detection, 90° turns, and potential 180° sequences.",
+     QTP4_STEPS),
+    ("QTP5", "QTP5: RED End-of-Maze",
+     "Tests RED line detection signaling end of maze and return to IDLE.",
+     QTP5_STEPS),
+    ("Full Maze", "Full Maze: All Colors",
+     "Complete maze simulation: Calibration → GREEN → BLUE → BLACK → RED (End)",
+     FULL_MAZE_STEPS),
+)
 
 # ==================== MAIN TESTER CLASS ====================
 
 class NAVCONTester:
     """Main NAVCON Testing Application"""
 
-    def __init__(self):
+    # Log colour per message type, configured once as text tags on the log widget.
+    # Other types fall back to the widget's light gray foreground
+    LOG_COLORS = {
+        "SENT": "#3498db",      # Blue
+        "RECEIVED": "#27ae60",  # Green
+        "ERROR": "#e74c3c",     # Red
+        "SUCCESS": "#2ecc71",   # Bright green
+        "INFO": "#ecf0f1"       # Light gray
+    }
+
+    def __init__(self, max_log_entries: int = MAX_LOG_ENTRIES):
         self.serial_port = None
         self.is_connected = False
         self.test_running = False
-        self.message_queue = queue.Queue()
-        self.packet_log = []
+        self.stop_event = threading.Event()  # Set by stop_test to cut short the test thread's sleeps
+        # (msg_type, data) items for get_messages. Single producer (RX thread) and single
+        # consumer (test thread), so a deque plus a wakeup Event replaces a locked Queue
+        self.message_queue = deque(maxlen=MESSAGE_QUEUE_LIMIT)  # Oldest items drop on overflow
+        self._msg_event = threading.Event()
+        self.analysis_queue = queue.Queue()
+        self.rx_event = threading.Event()  # Set by the RX thread on every received packet
+        self.maze_event = threading.Event()  # Set by the RX thread on every MAZE:SNC packet
+
+        # Response matching for the wait_for_* helpers: the RX thread records the sequence
+        # number of the latest packet per (state, subsystem, ist) and notifies waiters.
+        # Packets at or below _rx_consumed have already been seen by a previous wait.
+        self.response_cv = threading.Condition()
+        self.latest_rx = {}
+        self._rx_seq = 0
+        self._rx_consumed = 0
+        self.max_log_entries = max_log_entries
+        self.packet_log = deque(maxlen=max_log_entries)  # Oldest entries drop off on long runs
+        self.rx_raw_log = bytearray()  # Raw received packets, 4 bytes each, newest last
         self.current_scenario = None
 
-        # Test state tracking
-        self.test_state = {
-            'system_state': SystemState.IDLE,
-            'sequence_number': 0,
-            'touch_count': 0,
-            'rotation_count': 0,
-            'green_detections': 0,
-            'total_packets_sent': 0,
-            'total_packets_received': 0,
-            'test_start_time': None
-        }
+        # Log lines waiting to be written to the log widget by _flush_log. Any thread
+        # appends; only the GUI thread pops, so no lock is needed
+        self._log_buf = deque(maxlen=LOG_BUFFER_LIMIT)
+        self._gui_calls = deque()  # Callables from worker threads, handed to the GUI thread by _flush_log
+        # When False, sent packets are counted but not logged; set from the "Log sent packets" checkbox
+        self.verbose_sends = True
+
+        # Test state tracking. Counters touched for every packet are plain attributes rather
+        # than dict entries; update_statistics reads them directly
+        self.test_start_time = None
+        self._sent_count = 0
+        self._seq_num = 0
+        self._touch_count = 0
+        self._green_detections = 0
+        self.system_state = SystemState.IDLE
+        self._rx_count = 0
+        self._rotation_count = 0
+        self._last_stats = {}  # Text last shown on each statistics label
 
         # Initialize GUI
         self.setup_gui()
         self.create_test_scenarios()
+        self.root.after(33, self._drain_analysis_queue)
+        self.root.after(200, self._periodic_stats_refresh)
+        self.root.after(33, self._flush_log)
 
     def setup_gui(self):
         """Initialize the GUI"""
@@ -281,10 +727,18 @@ class NAVCONTester:
                                bg='#3498db', fg='white', font=('Arial', 9, 'bold'))
         save_log_btn.pack(side='left', padx=(10, 0))
 
+        self.verbose_sends_var = tk.BooleanVar(value=self.verbose_sends)
+        verbose_sends_check = tk.Checkbutton(log_control_frame, text="Log sent packets",
+                                           variable=self.verbose_sends_var, command=self.on_verbose_sends_toggled,
+                                           bg='#ecf0f1', font=('Arial', 9))
+        verbose_sends_check.pack(side='left', padx=(10, 0))
+
         # Packet log display
         self.log_text = scrolledtext.ScrolledText(log_frame, wrap='none', font=('Courier New', 9),
                                                 bg='#2c3e50', fg='#ecf0f1', selectbackground='#3498db')
         self.log_text.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        for msg_type, color in self.LOG_COLORS.items():
+            self.log_text.tag_configure(msg_type, foreground=color)
 
         # Statistics tab
         stats_frame = tk.Frame(notebook, bg='#ecf0f1')
@@ -362,7 +816,8 @@ class NAVCONTester:
                 messagebox.showerror("Error", "Please select a serial port")
                 return
 
-            self.serial_port = serial.Serial(port, baud, timeout=1)
+            # Short read timeout: the monitor thread pulls whole bursts in one read
+            self.serial_port = serial.Serial(port, baud, timeout=0.05)
             self.is_connected = True
 
             self.status_label.config(text="✅ Connected", fg='#27ae60')
@@ -398,361 +853,167 @@ class NAVCONTester:
     def monitor_serial(self):
         """Monitor incoming serial data"""
         buffer = bytearray()
+        selector = self._open_rx_selector()
 
         while self.is_connected:
             try:
-                if self.serial_port and self.serial_port.in_waiting > 0:
-                    data = self.serial_port.read(self.serial_port.in_waiting)
-                    buffer.extend(data)
-
-                    # Process complete packets (4 bytes each)
-                    while len(buffer) >= 4:
-                        packet_bytes = buffer[:4]
-                        buffer = buffer[4:]
-
-                        packet = SCSPacket(packet_bytes[0], packet_bytes[1], packet_bytes[2], packet_bytes[3])
-                        self.handle_received_packet(packet)
-
-                time.sleep(0.01)  # Small delay to prevent excessive CPU usage
+                if selector is not None:
+                    # Sleep in the kernel until the port is readable, then take everything waiting
+                    if not selector.select(timeout=0.5):
+                        continue
+                    data = self.serial_port.read(self.serial_port.in_waiting or 1)
+                else:
+                    # Returns with the first byte (or at the port timeout) and takes a whole
+                    # buffered burst in one call; read(256) would wait out the timeout for
+                    # every short reply
+                    data = self.serial_port.read(self.serial_port.in_waiting or 1)
+                if not data:
+                    continue
+                buffer.extend(data)
+
+                # Process all complete packets (4 bytes each) in one pass, each as its own
+                # 4-byte bytes object sliced from a single copy of the frames
+                end = len(buffer) // 4 * 4
+                frames = bytes(buffer[:end])
+                for i in range(0, end, 4):
+                    self.handle_received_packet(frames[i:i + 4])
+
+                # Keep a raw copy of the received packets for save_log
+                self.rx_raw_log += frames
+                excess = len(self.rx_raw_log) - 4 * self.max_log_entries
+                if excess > 0:
+                    del self.rx_raw_log[:excess]
+
+                # Drop the consumed bytes once per wake; at most 3 stay behind
+                del buffer[:end]
 
             except Exception as e:
                 if self.is_connected:  # Only log if we're supposed to be connected
                     self.log_message(f"❌ Serial monitoring error: {str(e)}", "ERROR")
                 break
 
-    def handle_received_packet(self, packet: SCSPacket):
-        """Handle received packet from SNC"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        self.test_state['total_packets_received'] += 1
+        if selector is not None:
+            selector.close()
+
+    def _open_rx_selector(self) -> Optional[selectors.BaseSelector]:
+        """Readiness selector on the serial port's file descriptor
 
-        sys_state, subsystem, ist = parse_control_byte(packet.control)
+        Only POSIX ports expose a selectable fd; returns None elsewhere (e.g. Windows
+        COM ports), in which case monitor_serial falls back to timed reads.
+        """
+        try:
+            fd = self.serial_port.fileno()
+        except (AttributeError, OSError):
+            return None
 
-        # Log the received packet
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(fd, selectors.EVENT_READ)
+        except (OSError, ValueError):
+            selector.close()
+            return None
+        return selector
+
+    def handle_received_packet(self, raw: bytes):
+        """Handle received packet from SNC, given as its 4 wire bytes"""
+        now = time.time()
+        timestamp = _fmt_ts(now)
+        self._rx_count += 1
+
+        sys_state, subsystem, ist = _CTRL_TABLE[raw[0]]
+
+        # Log the received packet (the SCSPacket only exists to format the line)
         direction = "RECEIVED"
-        log_line = f"{timestamp} || {self.test_state['total_packets_received']:3} || {direction:8} || {packet}"
+        log_line = f"{timestamp} || {self._rx_count:3} || {direction:8} || {SCSPacket(*raw)}"
         self.log_message(log_line, "RECEIVED")
 
-        # Track last received packet timestamp for turn-based protocol
-        self.last_received_time = time.time()
-        self.last_received_packet = packet
+        # Signal the turn-based MAZE loop that SNC has answered
+        self.rx_event.set()
+
+        # Wake any wait_for_* helper looking for this (state, subsystem, ist)
+        with self.response_cv:
+            self._rx_seq += 1
+            self.latest_rx[(sys_state, subsystem, ist)] = self._rx_seq
+            self.response_cv.notify_all()
 
         # Update test state
-        if subsystem == SubsystemID.SNC:
-            self.test_state['system_state'] = sys_state
+        if subsystem is _SNC:
+            self.system_state = sys_state
+            if sys_state is _MAZE:
+                self.maze_event.set()
 
             # Analyze packet for test progress
-            self.analyze_received_packet(packet, sys_state, ist)
-
-        # Update statistics display
-        self.update_statistics()
+            self.analyze_received_packet(raw, sys_state, ist, timestamp)
 
-        # Queue packet for processing
-        self.message_queue.put(('received_packet', packet))
+        # Queue the raw bytes for processing; consumers test the control byte directly
+        self.message_queue.append(('received_packet', raw))
+        self._msg_event.set()
 
-    def analyze_received_packet(self, packet: SCSPacket, sys_state: SystemState, ist: int):
+    def analyze_received_packet(self, raw: bytes, sys_state: SystemState, ist: int, timestamp: str):
         """Analyze received packet and update test progress"""
+        if sys_state is _MAZE and ist == 1:
+            self._rotation_count += 1
+
+        # Text is built and displayed on the GUI thread by _drain_analysis_queue
+        self.analysis_queue.put((timestamp, raw, sys_state, ist))
+
+    def format_packet_analysis(self, timestamp: str, raw: bytes, sys_state: SystemState, ist: int) -> str:
+        """Build the packet analysis text for one received SNC packet"""
+        packet = SCSPacket(*raw)
         analysis = []
 
         analysis.append(f"📥 RECEIVED PACKET ANALYSIS")
-        analysis.append(f"Timestamp: {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
+        analysis.append(f"Timestamp: {timestamp}")
         analysis.append(f"Raw Bytes: [{packet.control:02X}, {packet.dat1:02X}, {packet.dat0:02X}, {packet.dec:02X}]")
         analysis.append(f"System State: {sys_state.name}")
         analysis.append(f"Internal State: {ist}")
         analysis.append(f"Data: DAT1={packet.dat1}, DAT0={packet.dat0}, DEC={packet.dec}")
 
         # Interpret based on state and IST
-        if sys_state == SystemState.MAZE and ist == 3:
+        if sys_state is _MAZE and ist == 3:
             analysis.append("🎯 NAVCON ACTIVE - IST=3 detected")
             analysis.append(f"Speed Command: vR={packet.dat1}, vL={packet.dat0}")
             if packet.dec > 0:
                 analysis.append(f"⚠️ Special condition: DEC={packet.dec}")
 
-        elif sys_state == SystemState.MAZE and ist == 1:
+        elif sys_state is _MAZE and ist == 1:
             analysis.append("🔄 ROTATION REQUEST detected")
             angle = (packet.dat1 << 8) | packet.dat0
             direction = "RIGHT" if packet.dec == 2 else "LEFT" if packet.dec == 1 else "UNKNOWN"
             analysis.append(f"Rotation: {angle/10:.1f}° {direction}")
-            self.test_state['rotation_count'] += 1
 
-        elif sys_state == SystemState.CAL:
+        elif sys_state is _CAL:
             analysis.append("🛠️ CALIBRATION state")
 
-        elif sys_state == SystemState.IDLE:
+        elif sys_state is _IDLE:
             analysis.append("⏸️ IDLE state")
 
-        elif sys_state == SystemState.SOS:
+        elif sys_state is _SOS:
             analysis.append("🚨 SOS state")
 
         analysis.append("-" * 50)
 
-        # Update packet analysis display
-        self.packet_analysis_text.insert(tk.END, "\n".join(analysis) + "\n\n")
-        self.packet_analysis_text.see(tk.END)
-
-    def create_test_scenarios(self):
-        """Create predefined test scenarios"""
-        self.scenarios = {}
-
-        # ============================================================
-        # QTP1: Initial Calibration and First GREEN Line
-        # ============================================================
-        qtp1 = NAVCONTestScenario("QTP1: First GREEN Line",
-                                "Tests system initialization, calibration, and first GREEN line detection with proper REVERSE behavior.")
-
-        # IDLE Phase - Initial contact
-        qtp1.add_step(SCSPacket(0, 0, 0, 0), "HUB: Initial contact (IDLE-HUB-0)")
-
-        # Expect SNC response: (0-1-0) with DAT1=1, DAT0=50
+        return "\n".join(analysis) + "\n\n"
 
-        # CAL Phase - Calibration sequence (simplified - normally 60 seconds)
-        qtp1.add_step(SCSPacket(112, 0, 0, 0), "SS: Start calibration (CAL-SS-0)")
-        qtp1.add_step(SCSPacket(96, 10, 10, 0), "MDPS: Start calibration (CAL-MDPS-0)")
-        qtp1.add_step(SCSPacket(97, 90, 0, 0), "MDPS: Calibration rotation 90° (CAL-MDPS-1)")
-        qtp1.add_step(SCSPacket(113, 0, 0, 0), "SS: Calibration complete (CAL-SS-1)")
-
-        # Repeat calibration packets (10 cycles to simulate sustained calibration)
-        for i in range(10):
-            qtp1.add_step(SCSPacket(97, 90, 0, 0), f"MDPS: Calibration cycle {i+1}")
-            qtp1.add_step(SCSPacket(113, 0, 0, 0), f"SS: Calibration cycle {i+1}")
-
-        # Expect SNC to transition to MAZE: (2-1-1) → (2-1-2) → (2-1-3)
+    def _drain_analysis_queue(self):
+        """Flush queued packet analyses into the display (runs on the GUI thread)"""
+        chunks = []
+        try:
+            while len(chunks) < 100:
+                chunks.append(self.format_packet_analysis(*self.analysis_queue.get_nowait()))
+        except queue.Empty:
+            pass
 
-        # MAZE Phase - First GREEN line encounter (angled line, 35°)
-        qtp1.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop command (MAZE-MDPS-1)")
-        qtp1.add_step(SCSPacket(162, 0, 0, 0), "MDPS: Stopped (MAZE-MDPS-2)")
-        qtp1.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Slow forward (MAZE-MDPS-3)")
-        qtp1.add_step(SCSPacket(164, 0, 50, 0), "MDPS: Distance 50mm (MAZE-MDPS-4)")
-
-        # GREEN line S2 detection: Color=2 (GREEN), Angle=35°
-        # Color encoding: S1=0, S2=2, S3=0 → packed = (0<<6)|(2<<3)|(0) = 16 (0x10)
-        qtp1.add_step(SCSPacket(177, 0, 16, 0), "SS: GREEN on S2 (MAZE-SS-1)")
-        qtp1.add_step(SCSPacket(178, 35, 0, 0), "SS: Incidence angle 35° (MAZE-SS-2)")
-
-        # Expect SNC to: STOP → REVERSE → STOP → ROTATE
-        # Validate N1.2 compliance: SNC must send (2-1-2) REVERSE before (2-1-1) rotation
-
-        qtp1.add_step(SCSPacket(162, 0, 6, 3), "MDPS: Reverse complete 60mm (MAZE-MDPS-2)")
-        qtp1.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop before rotate (MAZE-MDPS-1)")
-        qtp1.add_step(SCSPacket(162, 0, 0, 0), "MDPS: Stopped (MAZE-MDPS-2)")
-
-        # Expect SNC rotation command: (2-1-1) with target angle
-
-        qtp1.add_step(SCSPacket(162, 0, 35, 2), "MDPS: Rotation 35° RIGHT complete (MAZE-MDPS-2)")
-        qtp1.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Resume forward (MAZE-MDPS-3)")
-        qtp1.add_step(SCSPacket(177, 0, 0, 0), "SS: All sensors WHITE (MAZE-SS-1)")
-
-        self.scenarios["QTP1"] = qtp1
-
-        # ============================================================
-        # QTP2: Multiple GREEN Lines (Navigable)
-        # ============================================================
-        qtp2 = NAVCONTestScenario("QTP2: GREEN Lines (Navigable)",
-                                "Tests multiple GREEN line encounters with various angles and correction sequences.")
-
-        # Start from active MAZE state
-        qtp2.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward movement")
-        qtp2.add_step(SCSPacket(164, 0, 100, 0), "MDPS: Distance 100mm")
-
-        # GREEN Line #1: Steep angle (46°) requiring correction
-        qtp2.add_step(SCSPacket(177, 0, 16, 0), "SS: GREEN on S2 (Color=2)")
-        qtp2.add_step(SCSPacket(178, 46, 0, 0), "SS: Angle 46° (steep)")
-
-        # Expect: STOP → REVERSE → STOP → ROTATE RIGHT
-        qtp2.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop")
-        qtp2.add_step(SCSPacket(162, 0, 0, 0), "MDPS: Stopped")
-        qtp2.add_step(SCSPacket(162, 0, 6, 3), "MDPS: Reverse 60mm")
-        qtp2.add_step(SCSPacket(162, 0, 46, 2), "MDPS: Rotate 46° RIGHT")
-        qtp2.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward")
-        qtp2.add_step(SCSPacket(177, 0, 0, 0), "SS: WHITE")
-
-        qtp2.add_step(SCSPacket(164, 0, 150, 0), "MDPS: Distance 150mm")
-
-        # GREEN Line #2: Small angle (15°) - safe to cross with steering
-        qtp2.add_step(SCSPacket(177, 0, 16, 0), "SS: GREEN on S2")
-        qtp2.add_step(SCSPacket(178, 15, 0, 0), "SS: Angle 15°")
-
-        # Expect: STOP → small correction → CROSS
-        qtp2.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop")
-        qtp2.add_step(SCSPacket(162, 0, 10, 2), "MDPS: Small 10° correction")
-        qtp2.add_step(SCSPacket(163, 10, 10, 1), "MDPS: Crossing line")
-        qtp2.add_step(SCSPacket(177, 0, 0, 0), "SS: WHITE")
-
-        qtp2.add_step(SCSPacket(164, 0, 120, 0), "MDPS: Distance 120mm")
-
-        # GREEN Line #3: Very safe (5°) - direct cross
-        qtp2.add_step(SCSPacket(177, 0, 16, 0), "SS: GREEN on S2")
-        qtp2.add_step(SCSPacket(178, 5, 0, 0), "SS: Angle 5° (safe)")
-
-        # Expect: Direct crossing with minimal adjustment
-        qtp2.add_step(SCSPacket(163, 10, 10, 1), "MDPS: Crossing safely")
-        qtp2.add_step(SCSPacket(177, 0, 0, 0), "SS: WHITE")
+        if chunks:
+            self.packet_analysis_text.insert(tk.END, "".join(chunks))
+            self.packet_analysis_text.see(tk.END)
 
-        self.scenarios["QTP2"] = qtp2
+        self.root.after(33, self._drain_analysis_queue)
 
-        # ============================================================
-        # QTP3: BLUE Wall Lines (Must Avoid)
-        # ============================================================
-        qtp3 = NAVCONTestScenario("QTP3: BLUE Walls",
-                                "Tests BLUE wall detection and 90° avoidance turns.")
-
-        qtp3.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward")
-        qtp3.add_step(SCSPacket(164, 0, 80, 0), "MDPS: Distance 80mm")
-
-        # BLUE Wall #1: 30° angle - RIGHT turn to avoid
-        # Color encoding: S1=0, S2=3 (BLUE), S3=0 → packed = (0<<6)|(3<<3)|(0) = 24 (0x18)
-        qtp3.add_step(SCSPacket(177, 0, 24, 0), "SS: BLUE wall on S2 (Color=3)")
-        qtp3.add_step(SCSPacket(178, 30, 0, 0), "SS: Angle 30°")
-
-        # Expect: STOP → REVERSE → STOP → 90° RIGHT turn
-        qtp3.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop")
-        qtp3.add_step(SCSPacket(162, 0, 6, 3), "MDPS: Reverse 60mm")
-        qtp3.add_step(SCSPacket(162, 0, 90, 2), "MDPS: 90° RIGHT to avoid BLUE")
-        qtp3.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward")
-        qtp3.add_step(SCSPacket(177, 0, 0, 0), "SS: WHITE")
-
-        qtp3.add_step(SCSPacket(164, 0, 100, 0), "MDPS: Distance 100mm")
-
-        # BLUE Wall #2: Steep 52° - RIGHT turn
-        qtp3.add_step(SCSPacket(177, 0, 24, 0), "SS: BLUE wall steep")
-        qtp3.add_step(SCSPacket(178, 52, 0, 0), "SS: Angle 52°")
-
-        qtp3.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop")
-        qtp3.add_step(SCSPacket(162, 0, 6, 3), "MDPS: Reverse")
-        qtp3.add_step(SCSPacket(162, 0, 90, 2), "MDPS: 90° RIGHT")
-        qtp3.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward")
-        qtp3.add_step(SCSPacket(177, 0, 0, 0), "SS: WHITE")
-
-        self.scenarios["QTP3"] = qtp3
-
-        # ============================================================
-        # QTP4: BLACK Wall Lines (Must Avoid)
-        # ============================================================
-        qtp4 = NAVCONTestScenario("QTP4: BLACK Walls",
-                                "Tests BLACK wall detection, 90° turns, and potential 180° sequences.")
-
-        qtp4.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward")
-        qtp4.add_step(SCSPacket(164, 0, 90, 0), "MDPS: Distance 90mm")
-
-        # BLACK Wall #1: 28° angle - RIGHT turn
-        # Color encoding: S1=0, S2=4 (BLACK), S3=0 → packed = (0<<6)|(4<<3)|(0) = 32 (0x20)
-        qtp4.add_step(SCSPacket(177, 0, 32, 0), "SS: BLACK wall on S2 (Color=4)")
-        qtp4.add_step(SCSPacket(178, 28, 0, 0), "SS: Angle 28°")
-
-        # Expect: STOP → REVERSE → STOP → 90° RIGHT
-        qtp4.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop")
-        qtp4.add_step(SCSPacket(162, 0, 6, 3), "MDPS: Reverse 60mm")
-        qtp4.add_step(SCSPacket(162, 0, 90, 2), "MDPS: 90° RIGHT to avoid BLACK")
-        qtp4.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward")
-        qtp4.add_step(SCSPacket(177, 0, 0, 0), "SS: WHITE")
-
-        qtp4.add_step(SCSPacket(164, 0, 80, 0), "MDPS: Distance 80mm")
-
-        # BLACK Wall #2: Second BLACK at 35° (triggers 180° logic)
-        qtp4.add_step(SCSPacket(177, 0, 32, 0), "SS: BLACK wall again")
-        qtp4.add_step(SCSPacket(178, 35, 0, 0), "SS: Angle 35°")
-
-        # Expect: STOP → REVERSE → 180° turn (90° + 90°)
-        qtp4.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop")
-        qtp4.add_step(SCSPacket(162, 0, 6, 3), "MDPS: Reverse")
-        qtp4.add_step(SCSPacket(162, 0, 180, 2), "MDPS: 180° turn (second BLACK)")
-        qtp4.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward")
-        qtp4.add_step(SCSPacket(177, 0, 0, 0), "SS: WHITE")
-
-        self.scenarios["QTP4"] = qtp4
-
-        # ============================================================
-        # QTP5: RED Line (End of Maze)
-        # ============================================================
-        qtp5 = NAVCONTestScenario("QTP5: RED End-of-Maze",
-                                "Tests RED line detection signaling end of maze and return to IDLE.")
-
-        qtp5.add_step(SCSPacket(163, 10, 10, 0), "MDPS: Forward")
-        qtp5.add_step(SCSPacket(164, 0, 100, 0), "MDPS: Distance 100mm")
-
-        # RED Line: End of maze marker
-        # Color encoding: S1=1, S2=1, S3=1 (All RED) → packed = (1<<6)|(1<<3)|(1) = 73 (0x49)
-        qtp5.add_step(SCSPacket(177, 0, 73, 0), "SS: RED detected - END OF MAZE (All sensors RED)")
-        qtp5.add_step(SCSPacket(178, 0, 0, 0), "SS: Angle N/A")
-
-        # Expect: STOP immediately, no rotation needed
-        qtp5.add_step(SCSPacket(161, 90, 0, 0), "MDPS: Stop")
-        qtp5.add_step(SCSPacket(162, 0, 0, 0), "MDPS: Stopped at end")
-
-        # SS signals end of maze with IST=3
-        qtp5.add_step(SCSPacket(179, 0, 0, 0), "SS: End of maze signal (MAZE-SS-3)")
-
-        # Expect SNC to transition back to IDLE: (0-1-0)
-
-        qtp5.add_step(SCSPacket(0, 0, 0, 0), "System return to IDLE")
-
-        self.scenarios["QTP5"] = qtp5
-
-        # ============================================================
-        # Full Maze: Complete Run Through All Line Types
-        # ============================================================
-        full_maze = NAVCONTestScenario("Full Maze: All Colors",
-                                     "Complete maze simulation: Calibration → GREEN → BLUE → BLACK → RED (End)")
-
-        # Phase 1: Calibration (from QTP1)
-        full_maze.add_step(SCSPacket(0, 0, 0, 0), "HUB: Initial contact")
-        full_maze.add_step(SCSPacket(112, 0, 0, 0), "SS: Start calibration")
-        full_maze.add_step(SCSPacket(96, 10, 10, 0), "MDPS: Start calibration")
-        full_maze.add_step(SCSPacket(97, 90, 0, 0), "MDPS: Rotation calibration")
-        full_maze.add_step(SCSPacket(113, 0, 0, 0), "SS: Calibration complete")
-
-        for i in range(5):
-            full_maze.add_step(SCSPacket(97, 90, 0, 0), f"CAL cycle {i+1}")
-            full_maze.add_step(SCSPacket(113, 0, 0, 0), f"CAL cycle {i+1}")
-
-        # Phase 2: GREEN lines (navigable)
-        full_maze.add_step(SCSPacket(163, 10, 10, 0), "MAZE: Start forward")
-        full_maze.add_step(SCSPacket(164, 0, 100, 0), "Distance 100mm")
-        full_maze.add_step(SCSPacket(177, 0, 16, 0), "GREEN line 1 (35°)")
-        full_maze.add_step(SCSPacket(178, 35, 0, 0), "Angle 35°")
-        full_maze.add_step(SCSPacket(161, 90, 0, 0), "Stop")
-        full_maze.add_step(SCSPacket(162, 0, 6, 3), "Reverse")
-        full_maze.add_step(SCSPacket(162, 0, 35, 2), "Rotate 35°")
-        full_maze.add_step(SCSPacket(163, 10, 10, 0), "Forward")
-        full_maze.add_step(SCSPacket(177, 0, 0, 0), "WHITE")
-
-        # Phase 3: BLUE wall
-        full_maze.add_step(SCSPacket(164, 0, 120, 0), "Distance 120mm")
-        full_maze.add_step(SCSPacket(177, 0, 24, 0), "BLUE wall (30°)")
-        full_maze.add_step(SCSPacket(178, 30, 0, 0), "Angle 30°")
-        full_maze.add_step(SCSPacket(161, 90, 0, 0), "Stop")
-        full_maze.add_step(SCSPacket(162, 0, 6, 3), "Reverse")
-        full_maze.add_step(SCSPacket(162, 0, 90, 2), "90° RIGHT avoid")
-        full_maze.add_step(SCSPacket(163, 10, 10, 0), "Forward")
-        full_maze.add_step(SCSPacket(177, 0, 0, 0), "WHITE")
-
-        # Phase 4: BLACK wall
-        full_maze.add_step(SCSPacket(164, 0, 90, 0), "Distance 90mm")
-        full_maze.add_step(SCSPacket(177, 0, 32, 0), "BLACK wall (28°)")
-        full_maze.add_step(SCSPacket(178, 28, 0, 0), "Angle 28°")
-        full_maze.add_step(SCSPacket(161, 90, 0, 0), "Stop")
-        full_maze.add_step(SCSPacket(162, 0, 6, 3), "Reverse")
-        full_maze.add_step(SCSPacket(162, 0, 90, 2), "90° RIGHT avoid")
-        full_maze.add_step(SCSPacket(163, 10, 10, 0), "Forward")
-        full_maze.add_step(SCSPacket(177, 0, 0, 0), "WHITE")
-
-        # Phase 5: Another GREEN
-        full_maze.add_step(SCSPacket(164, 0, 110, 0), "Distance 110mm")
-        full_maze.add_step(SCSPacket(177, 0, 16, 0), "GREEN line 2 (12°)")
-        full_maze.add_step(SCSPacket(178, 12, 0, 0), "Angle 12°")
-        full_maze.add_step(SCSPacket(161, 90, 0, 0), "Stop")
-        full_maze.add_step(SCSPacket(162, 0, 12, 2), "Small correction")
-        full_maze.add_step(SCSPacket(163, 10, 10, 1), "Cross line")
-        full_maze.add_step(SCSPacket(177, 0, 0, 0), "WHITE")
-
-        # Phase 6: RED end of maze
-        full_maze.add_step(SCSPacket(164, 0, 150, 0), "Distance 150mm")
-        full_maze.add_step(SCSPacket(177, 0, 73, 0), "RED - END OF MAZE!")
-        full_maze.add_step(SCSPacket(161, 90, 0, 0), "Final stop")
-        full_maze.add_step(SCSPacket(162, 0, 0, 0), "Stopped")
-        full_maze.add_step(SCSPacket(179, 0, 0, 0), "End of maze signal")
-        full_maze.add_step(SCSPacket(0, 0, 0, 0), "Return to IDLE")
-
-        self.scenarios["Full Maze"] = full_maze
+    def create_test_scenarios(self):
+        """Register predefined test scenarios; each is built the first time it is selected"""
+        self._scenario_specs = {key: (name, description, steps) for key, name, description, steps in _SCENARIOS}
+        self.scenarios = dict.fromkeys(self._scenario_specs)
 
         # Update combo box
         scenario_names = list(self.scenarios.keys())
@@ -761,17 +1022,33 @@ class NAVCONTester:
             self.scenario_combo.set(scenario_names[0])
             self.on_scenario_selected(None)
 
+    def get_scenario(self, key: str) -> NAVCONTestScenario:
+        """Return the scenario registered under key, building it on first use"""
+        scenario = self.scenarios[key]
+        if scenario is None:
+            name, description, steps = self._scenario_specs[key]
+            scenario = NAVCONTestScenario(name, description)
+            scenario.add_steps(steps)
+            scenario.finalize()
+            self.scenarios[key] = scenario
+        return scenario
+
     def on_scenario_selected(self, event):
         """Handle scenario selection"""
         scenario_name = self.scenario_var.get()
         if scenario_name in self.scenarios:
-            scenario = self.scenarios[scenario_name]
+            scenario = self.get_scenario(scenario_name)
             self.current_scenario = scenario
 
             # Update description
             self.desc_text.delete(1.0, tk.END)
             self.desc_text.insert(1.0, scenario.description)
 
+    def on_verbose_sends_toggled(self):
+        """Handle the "Log sent packets" checkbox"""
+        # Copied to a plain attribute: the test thread reads it and must not touch Tk variables
+        self.verbose_sends = self.verbose_sends_var.get()
+
     def start_test(self):
         """Start the selected test scenario"""
         if not self.is_connected:
@@ -783,10 +1060,16 @@ class NAVCONTester:
             return
 
         self.test_running = True
-        self.test_state['test_start_time'] = time.time()
-        self.test_state['sequence_number'] = 0
-        self.test_state['total_packets_sent'] = 0
-        self.test_state['total_packets_received'] = 0
+        self.stop_event.clear()
+        self.test_start_time = time.monotonic()
+        self._seq_num = 0
+        self._sent_count = 0
+        self._rx_count = 0
+
+        # Nothing received before this run may satisfy its waits
+        self.message_queue.clear()
+        with self.response_cv:
+            self._rx_consumed = self._rx_seq
 
         self.start_test_btn.config(state='disabled')
         self.stop_test_btn.config(state='normal')
@@ -805,11 +1088,14 @@ class NAVCONTester:
             # ========================================
             self.log_message("📡 PHASE 1: Establishing IDLE connection...", "INFO")
 
-            self.send_packet(SCSPacket(0, 0, 0, 0), "HUB: IDLE:HUB:0")
-            time.sleep(1.0)
+            self.send_packet(PKT_IDLE_HUB_0, "HUB: IDLE:HUB:0")
+            if not self.test_sleep(1.0):
+                return  # Stopped
 
             # Wait for IDLE:SNC:0
             if not self.wait_for_snc_response(SystemState.IDLE, 0, timeout=5.0):
+                if not self.test_running:
+                    return
                 self.log_message("❌ No IDLE:SNC:0 response", "ERROR")
                 self.stop_test()
                 return
@@ -822,17 +1108,23 @@ class NAVCONTester:
             self.log_message("🛠️ PHASE 2: CAL initialization...", "INFO")
 
             # Send CAL init sequence (lines 4-7 from log)
-            self.send_packet(SCSPacket(112, 0, 0, 0), "SS: CAL:SS:0")
-            time.sleep(0.1)
-            self.send_packet(SCSPacket(96, 10, 10, 0), "MDPS: CAL:MDPS:0")
-            time.sleep(0.1)
-            self.send_packet(SCSPacket(97, 90, 0, 0), "MDPS: CAL:MDPS:1")
-            time.sleep(0.1)
-            self.send_packet(SCSPacket(113, 0, 0, 0), "SS: CAL:SS:1")
-            time.sleep(0.5)
+            self.send_packet(PKT_CAL_SS_0, "SS: CAL:SS:0")
+            if not self.test_sleep(0.1):
+                return  # Stopped
+            self.send_packet(PKT_CAL_MDPS_0, "MDPS: CAL:MDPS:0")
+            if not self.test_sleep(0.1):
+                return  # Stopped
+            self.send_packet(PKT_CAL_MDPS_1, "MDPS: CAL:MDPS:1")
+            if not self.test_sleep(0.1):
+                return  # Stopped
+            self.send_packet(PKT_CAL_SS_1, "SS: CAL:SS:1")
+            if not self.test_sleep(0.5):
+                return  # Stopped
 
             # Wait for CAL:SNC:0
             if not self.wait_for_snc_response(SystemState.CAL, 0, timeout=5.0):
+                if not self.test_running:
+                    return
                 self.log_message("⚠️ No CAL:SNC:0, continuing anyway...", "INFO")
 
             self.log_message("✅ CAL state entered", "SUCCESS")
@@ -842,20 +1134,24 @@ class NAVCONTester:
             # ========================================
             self.log_message("🎵 PHASE 3: CAL loop (waiting for pure tone)...", "INFO")
 
-            maze_detected = False
-            cal_loop_start = time.time()
-            cal_loop_timeout = 30.0
+            # maze_event only reports MAZE packets from here on; check_for_maze_transition
+            # covers those received since the CAL wait returned
+            self.maze_event.clear()
+            maze_detected = self.check_for_maze_transition()
+            cal_loop_deadline = time.monotonic() + 30.0
 
-            while self.test_running and not maze_detected and (time.time() - cal_loop_start) < cal_loop_timeout:
+            while self.test_running and not maze_detected and time.monotonic() < cal_loop_deadline:
                 # Send CAL:MDPS:1 and CAL:SS:1 (lines 9-110 pattern)
-                self.send_packet(SCSPacket(97, 90, 0, 0), "MDPS: CAL:MDPS:1")
-                time.sleep(0.1)
-                self.send_packet(SCSPacket(113, 0, 0, 0), "SS: CAL:SS:1")
-                time.sleep(0.4)
+                self.send_packet(PKT_CAL_MDPS_1, "MDPS: CAL:MDPS:1")
+                if not self.test_sleep(0.1):
+                    return  # Stopped
+                self.send_packet(PKT_CAL_SS_1, "SS: CAL:SS:1")
 
-                # Check for MAZE transition
-                maze_detected = self.check_for_maze_transition()
+                # Wait for MAZE transition, returning as soon as the RX thread sees one
+                maze_detected = self.maze_event.wait(0.4)
 
+            if not self.test_running:
+                return
             if not maze_detected:
                 self.log_message("❌ No MAZE transition detected", "ERROR")
                 self.stop_test()
@@ -874,6 +1170,14 @@ class NAVCONTester:
             if self.test_running:
                 self.stop_test()
 
+    def test_sleep(self, seconds: float) -> bool:
+        """Sleep on the test thread, waking early if the test is stopped
+
+        Returns:
+            True if the full time elapsed, False if stop_test was called
+        """
+        return not self.stop_event.wait(seconds)
+
     def wait_for_transition(self, send_packet: SCSPacket, send_description: str,
                            expected_state: SystemState, expected_subsystem: SubsystemID,
                            expected_ist: int, timeout: float, send_interval: float = 0.5) -> bool:
@@ -895,32 +1199,26 @@ class NAVCONTester:
         Returns:
             True if expected response received, False on timeout
         """
-        start_time = time.time()
-        last_send_time = 0
+        deadline = time.monotonic() + timeout
+        next_send_time = 0.0
+        expected = [(expected_state, expected_subsystem, expected_ist)]
+        send_raw = encode_packet(send_packet)  # Encoded once for every resend
 
         self.log_message(f"🔄 Waiting for ({expected_state.value}-{expected_subsystem.value}-{expected_ist})", "INFO")
 
-        while self.test_running and (time.time() - start_time) < timeout:
-            # Send packet at intervals
-            if time.time() - last_send_time >= send_interval:
-                self.send_packet(send_packet, send_description)
-                last_send_time = time.time()
-
-            # Check for response
-            try:
-                msg_type, data = self.message_queue.get(timeout=0.1)
-                if msg_type == 'received_packet':
-                    packet = data
-                    sys_state, subsystem, ist = parse_control_byte(packet.control)
+        while self.test_running:
+            now = time.monotonic()
+            if now >= deadline:
+                break
 
-                    # Check if this is the expected response
-                    if (sys_state == expected_state and
-                        subsystem == expected_subsystem and
-                        ist == expected_ist):
-                        return True
+            # Send packet at intervals
+            if now >= next_send_time:
+                self._send_raw(send_raw, send_description)
+                next_send_time = now + send_interval
 
-            except queue.Empty:
-                continue
+            # Sleep until the expected response arrives or the next send is due
+            if self.wait_for_rx_match(expected, min(next_send_time, deadline) - now):
+                return True
 
         return False
 
@@ -928,7 +1226,7 @@ class NAVCONTester:
                                         send_descriptions: List[str],
                                         expected_state: SystemState,
                                         expected_subsystem: SubsystemID,
-                                        expected_ist_list: List[int],
+                                        expected_ist_list: Iterable[int],
                                         timeout: float,
                                         send_interval: float = 0.5) -> bool:
         """
@@ -939,72 +1237,118 @@ class NAVCONTester:
             send_descriptions: List of descriptions for each packet
             expected_state: Expected SystemState in response
             expected_subsystem: Expected SubsystemID in response
-            expected_ist_list: List of acceptable IST values in response
+            expected_ist_list: Acceptable IST values in response
             timeout: Maximum time to wait (seconds)
             send_interval: Time between packet sends (seconds)
 
         Returns:
             True if expected response received, False on timeout
         """
-        start_time = time.time()
-        last_send_time = 0
+        deadline = time.monotonic() + timeout
+        next_send_time = 0.0
         packet_index = 0
+        send_raw = tuple(encode_packet(packet) for packet in send_packets)  # Encoded once for the rotation
+        expected_ist_set = frozenset(expected_ist_list)
+        expected = frozenset((expected_state, expected_subsystem, ist) for ist in expected_ist_set)
 
-        self.log_message(f"🔄 Waiting for ({expected_state.value}-{expected_subsystem.value}-{expected_ist_list})", "INFO")
-
-        while self.test_running and (time.time() - start_time) < timeout:
-            # Send packets in rotation at intervals
-            if time.time() - last_send_time >= send_interval:
-                self.send_packet(send_packets[packet_index], send_descriptions[packet_index])
-                packet_index = (packet_index + 1) % len(send_packets)
-                last_send_time = time.time()
+        state_value, subsystem_value = expected_state.value, expected_subsystem.value
+        self.log_message(f"🔄 Waiting for ({state_value}-{subsystem_value}-{sorted(expected_ist_set)})", "INFO")
 
-            # Check for response
-            try:
-                msg_type, data = self.message_queue.get(timeout=0.1)
-                if msg_type == 'received_packet':
-                    packet = data
-                    sys_state, subsystem, ist = parse_control_byte(packet.control)
+        while self.test_running:
+            now = time.monotonic()
+            if now >= deadline:
+                break
 
-                    # Check if this is the expected response
-                    if (sys_state == expected_state and
-                        subsystem == expected_subsystem and
-                        ist in expected_ist_list):
-                        return True
+            # Send packets in rotation at intervals
+            if now >= next_send_time:
+                self._send_raw(send_raw[packet_index], send_descriptions[packet_index])
+                packet_index = (packet_index + 1) % len(send_raw)
+                next_send_time = now + send_interval
 
-            except queue.Empty:
-                continue
+            # Sleep until an expected response arrives or the next send is due
+            if self.wait_for_rx_match(expected, min(next_send_time, deadline) - now):
+                return True
 
         return False
 
     def wait_for_snc_response(self, expected_state: SystemState, expected_ist: int, timeout: float) -> bool:
         """Wait for SNC to respond with specific state and IST"""
-        start_time = time.time()
-        while self.test_running and (time.time() - start_time) < timeout:
-            try:
-                msg_type, data = self.message_queue.get(timeout=0.1)
-                if msg_type == 'received_packet':
-                    packet = data
-                    sys_state, subsystem, ist = parse_control_byte(packet.control)
-                    if sys_state == expected_state and subsystem == SubsystemID.SNC and ist == expected_ist:
-                        return True
-            except queue.Empty:
-                continue
-        return False
+        return self.wait_for_rx_match([(expected_state, _SNC, expected_ist)], timeout)
+
+    def wait_for_rx_match(self, expected: Iterable[Tuple[SystemState, SubsystemID, int]], timeout: float) -> bool:
+        """
+        Block until a packet matching one of the expected (state, subsystem, ist) keys arrives
+
+        Packets received since the previous wait count, so a response that arrived just
+        before the wait started is not missed. Every packet up to the return point is
+        marked as consumed, whether or not it matched.
+
+        Returns:
+            True if a matching packet was received, False on timeout or test stop
+        """
+        def matched():
+            return any(self.latest_rx.get(key, 0) > self._rx_consumed for key in expected)
+
+        with self.response_cv:
+            self.response_cv.wait_for(lambda: matched() or not self.test_running, max(0.0, timeout))
+            found = self.test_running and matched()  # A stopped test never matches
+            self._rx_consumed = self._rx_seq
+        return found
+
+    # Every (state, subsystem, ist) key of a MAZE:SNC packet
+    _MAZE_SNC_KEYS = tuple((_MAZE, _SNC, ist) for ist in range(16))
 
     def check_for_maze_transition(self) -> bool:
-        """Check if SNC has transitioned to MAZE state"""
-        while not self.message_queue.empty():
-            try:
-                msg_type, data = self.message_queue.get_nowait()
-                if msg_type == 'received_packet':
-                    packet = data
-                    sys_state, subsystem, ist = parse_control_byte(packet.control)
-                    if sys_state == SystemState.MAZE and subsystem == SubsystemID.SNC:
-                        return True
-            except queue.Empty:
-                break
-        return False
+        """
+        Check if SNC has transitioned to MAZE state
+
+        Only packets not yet seen by a wait_for_* helper count, and like those helpers
+        this marks every packet received so far as consumed.
+        """
+        with self.response_cv:
+            latest_rx, consumed = self.latest_rx, self._rx_consumed
+            found = any(latest_rx.get(key, 0) > consumed for key in self._MAZE_SNC_KEYS)
+            self._rx_consumed = self._rx_seq
+        return found
+
+    # Virtual maze events for execute_maze_continuous_loop, sorted by loop number:
+    # (loop_count, SS color byte, SS angle, log message or None)
+    _MAZE_EVENTS = (
+        # First GREEN line - moderate angle; S2=GREEN (0b00010000)
+        (10, 16, 22, "🟢 GREEN line #1 detected (22° angle - moderate)"),
+        (15, 0, 0, "⚪ GREEN cleared - back to WHITE"),
+        # BLUE wall; S2=BLUE (0b00011000)
+        (25, 24, 30, "🔵 BLUE wall detected (30° angle) - should trigger 90° turn!"),
+        (30, 0, 0, "⚪ BLUE cleared"),
+        # Second GREEN line - moderate-high angle
+        (40, 16, 35, "🟢 GREEN line #2 detected (35° angle - moderate-high)"),
+        (45, 0, 0, "⚪ GREEN cleared"),
+        # Third GREEN line - LARGE ANGLE (>45°)
+        # Edge sensor triggers first - SS cannot measure angle! S1 (edge) = GREEN (0b00000010), no angle data
+        (50, 2, 0, "🟢 GREEN line #3 detected (>45° STEEP) - EDGE SENSOR triggered - angle=0 (SNC must calculate from distance)!"),
+        # Edge sensor still sees GREEN (steep angle means longer detection)
+        (54, 2, 0, None),
+        (55, 0, 0, "⚪ GREEN cleared (steep angle)"),
+        # BLACK wall; S2=BLACK (0b00100000)
+        (60, 32, 28, "⚫ BLACK wall detected (28° angle) - should trigger 90° turn!"),
+        (65, 0, 0, "⚪ BLACK cleared"),
+        # Fourth GREEN line - small angle
+        (70, 16, 8, "🟢 GREEN line #4 detected (8° angle - small)"),
+        (75, 0, 0, "⚪ GREEN cleared"),
+        # Fifth GREEN line - VERY LARGE ANGLE (>45°), edge sensor only
+        (80, 2, 0, "🟢 GREEN line #5 detected (>45° VERY STEEP) - EDGE SENSOR triggered - angle=0 (SNC must calculate)!"),
+        # Edge sensor still sees GREEN (very steep angle = longer detection)
+        (83, 2, 0, None),
+        (85, 0, 0, "⚪ GREEN cleared (very steep angle)"),
+        # Approaching end - robot should be rectifying alignment
+        (90, 0, 12, "⚠️ Approaching EOM - angle=12° (robot should rectify to <5°)"),
+        (92, 0, 7, "⚠️ EOM approach - angle=7° (still rectifying...)"),
+        (94, 0, 3, "✅ EOM approach - angle=3° (good alignment!)"),
+        (96, 0, 1, "✅ EOM approach - angle=1° (excellent alignment)"),
+        # RED end of maze - all sensors RED (0b01001001), aligned to <5°
+        (98, 73, 1, "🔴 RED END-OF-MAZE detected! Angle=1° (<5° requirement met) - SNC should accept EOM!"),
+        (99, 73, 0, "🔴 RED EOM confirmed - angle=0° (perfect) - maze complete!"),
+    )
 
     def execute_maze_continuous_loop(self):
         """
@@ -1019,36 +1363,42 @@ class NAVCONTester:
         current_angle = 0
         loop_count = 0
         max_loops = 100  # Safety limit
+        event_idx = 0  # Next entry of _MAZE_EVENTS to apply
 
         while self.test_running and loop_count < max_loops:
             loop_count += 1
             self.progress_var.set((loop_count / max_loops) * 100)
 
-            # ========================================
-            # Send MDPS packets (simulating motors)
-            # ========================================
-            self.send_packet(SCSPacket(161, 90, 0, 0), "MDPS: MAZE:MDPS:1 (stop/rotate)")
-            time.sleep(0.05)
-
-            self.send_packet(SCSPacket(162, 0, 0, 0), "MDPS: MAZE:MDPS:2 (confirm)")
-            time.sleep(0.05)
-
-            self.send_packet(SCSPacket(163, 10, 10, 0), "MDPS: MAZE:MDPS:3 (forward)")
-            time.sleep(0.05)
-
             # MDPS:4 with incrementing distance
             dat1 = distance // 100  # Upper byte (meters)
             dat0 = distance % 100   # Lower byte (cm)
-            self.send_packet(SCSPacket(164, dat1, dat0, 0), f"MDPS: MAZE:MDPS:4 (dist={distance})")
-            time.sleep(0.05)
+
+            tx_schedule = [
+                # MDPS packets (simulating motors)
+                (PKT_MAZE_MDPS_1, "MDPS: MAZE:MDPS:1 (stop/rotate)"),
+                (PKT_MAZE_MDPS_2, "MDPS: MAZE:MDPS:2 (confirm)"),
+                (PKT_MAZE_MDPS_3, "MDPS: MAZE:MDPS:3 (forward)"),
+                (pkt(164, dat1, dat0, 0), f"MDPS: MAZE:MDPS:4 (dist={distance})"),
+                # SS packets (simulating sensors)
+                (pkt(177, 0, current_color, 0), f"SS: MAZE:SS:1 (color={current_color})"),
+                (pkt(178, current_angle, 0, 0), f"SS: MAZE:SS:2 (angle={current_angle})"),
+            ]
 
             # ========================================
-            # Send SS packets (simulating sensors)
+            # Send all 6 packets
             # ========================================
-            self.send_packet(SCSPacket(177, 0, current_color, 0), f"SS: MAZE:SS:1 (color={current_color})")
-            time.sleep(0.05)
-
-            self.send_packet(SCSPacket(178, current_angle, 0, 0), f"SS: MAZE:SS:2 (angle={current_angle})")
+            if MAZE_TX_INTERVAL > 0:
+                # Send on absolute deadlines, MAZE_TX_INTERVAL apart. Sleeping to a deadline
+                # (rather than a fixed gap after each send) keeps timer overshoot and send
+                # time from accumulating over the six packets
+                tx_start = time.monotonic()
+                for i, (packet, description) in enumerate(tx_schedule):
+                    delay = tx_start + i * MAZE_TX_INTERVAL - time.monotonic()
+                    if delay > 0 and not self.test_sleep(delay):
+                        return  # Stopped
+                    self.send_packet(packet, description)
+            else:
+                self.send_batch(tx_schedule)
 
             # ========================================
             # WAIT for SNC response (turn-based protocol!)
@@ -1056,25 +1406,13 @@ class NAVCONTester:
             # The real HUB waits for SNC to respond after sending all 6 packets
             # This gives SNC time to process and respond with MAZE:SNC:[1,2,3]
 
-            # Record the timestamp before waiting
-            last_rx_time = getattr(self, 'last_received_time', 0)
-
-            # Wait for SNC response with timeout
-            timeout_start = time.time()
-            snc_responded = False
-
-            while (time.time() - timeout_start) < 0.5:  # 500ms timeout
-                # Check if we received a NEW packet since we started waiting
-                current_rx_time = getattr(self, 'last_received_time', 0)
-                if current_rx_time > last_rx_time:
-                    # SNC has responded!
-                    snc_responded = True
-                    break
-                time.sleep(0.01)  # Small delay to avoid busy-waiting
+            # Only packets received from now on count as a response
+            self.rx_event.clear()
+            snc_responded = self.rx_event.wait(0.5)  # 500ms timeout
 
             # Optional: Add delay if SNC didn't respond (give it more time)
-            if not snc_responded:
-                time.sleep(0.1)
+            if not snc_responded and not self.test_sleep(0.1):
+                return  # Stopped
 
             # ========================================
             # Update virtual maze state
@@ -1082,137 +1420,11 @@ class NAVCONTester:
             distance += 2  # Increment distance by 2cm each loop
 
             # Simulate FULL MAZE with all line types and angles
-            if loop_count == 10:
-                # First GREEN line - moderate angle
-                current_color = 16  # S2=GREEN (0b00010000)
-                current_angle = 22
-                self.log_message("🟢 GREEN line #1 detected (22° angle - moderate)", "INFO")
-
-            elif loop_count == 15:
-                # Clear GREEN
-                current_color = 0
-                current_angle = 0
-                self.log_message("⚪ GREEN cleared - back to WHITE", "INFO")
-
-            elif loop_count == 25:
-                # BLUE wall
-                current_color = 24  # S2=BLUE (0b00011000)
-                current_angle = 30
-                self.log_message("🔵 BLUE wall detected (30° angle) - should trigger 90° turn!", "INFO")
-
-            elif loop_count == 30:
-                # Clear BLUE
-                current_color = 0
-                current_angle = 0
-                self.log_message("⚪ BLUE cleared", "INFO")
-
-            elif loop_count == 40:
-                # Second GREEN line - moderate-high angle
-                current_color = 16  # S2=GREEN
-                current_angle = 35
-                self.log_message("🟢 GREEN line #2 detected (35° angle - moderate-high)", "INFO")
-
-            elif loop_count == 45:
-                # Clear GREEN
-                current_color = 0
-                current_angle = 0
-                self.log_message("⚪ GREEN cleared", "INFO")
-
-            elif loop_count == 50:
-                # Third GREEN line - LARGE ANGLE (>45°)
-                # Edge sensor triggers first - SS cannot measure angle!
-                current_color = 2   # S1 (edge) =GREEN (bit 0 set, 0b00000010)
-                current_angle = 0   # NO ANGLE DATA (edge sensor triggered first)
-                self.log_message("🟢 GREEN line #3 detected (>45° STEEP) - EDGE SENSOR triggered - angle=0 (SNC must calculate from distance)!", "INFO")
-
-            elif loop_count == 54:
-                # Edge sensor still sees GREEN  (steep angle means longer detection)
-                current_color = 2   # S1=GREEN (edge sensor)
-                current_angle = 0   # Still no angle (steep line)
-
-            elif loop_count == 55:
-                # Clear GREEN
-                current_color = 0
-                current_angle = 0
-                self.log_message("⚪ GREEN cleared (steep angle)", "INFO")
-
-            elif loop_count == 60:
-                # BLACK wall
-                current_color = 32  # S2=BLACK (0b00100000)
-                current_angle = 28
-                self.log_message("⚫ BLACK wall detected (28° angle) - should trigger 90° turn!", "INFO")
-
-            elif loop_count == 65:
-                # Clear BLACK
-                current_color = 0
-                current_angle = 0
-                self.log_message("⚪ BLACK cleared", "INFO")
-
-            elif loop_count == 70:
-                # Fourth GREEN line - small angle
-                current_color = 16  # S2=GREEN
-                current_angle = 8
-                self.log_message("🟢 GREEN line #4 detected (8° angle - small)", "INFO")
-
-            elif loop_count == 75:
-                # Clear GREEN
-                current_color = 0
-                current_angle = 0
-                self.log_message("⚪ GREEN cleared", "INFO")
-
-            elif loop_count == 80:
-                # Fifth GREEN line - VERY LARGE ANGLE (>45°)
-                # Edge sensor triggers first - SS cannot measure angle!
-                current_color = 2   # S1 (edge) = GREEN (0b00000010)
-                current_angle = 0   # NO ANGLE DATA (edge sensor triggered first)
-                self.log_message("🟢 GREEN line #5 detected (>45° VERY STEEP) - EDGE SENSOR triggered - angle=0 (SNC must calculate)!", "INFO")
-
-            elif loop_count == 83:
-                # Edge sensor still sees GREEN (very steep angle = longer detection)
-                current_color = 2   # S1=GREEN
-                current_angle = 0
-
-            elif loop_count == 85:
-                # Clear GREEN
-                current_color = 0
-                current_angle = 0
-                self.log_message("⚪ GREEN cleared (very steep angle)", "INFO")
-
-            elif loop_count == 90:
-                # Approaching end - robot should be rectifying alignment
-                current_color = 0
-                current_angle = 12  # Still slightly misaligned
-                self.log_message("⚠️ Approaching EOM - angle=12° (robot should rectify to <5°)", "INFO")
-
-            elif loop_count == 92:
-                # Robot rectifying
-                current_color = 0
-                current_angle = 7
-                self.log_message("⚠️ EOM approach - angle=7° (still rectifying...)", "INFO")
-
-            elif loop_count == 94:
-                # Robot should be nearly aligned now
-                current_color = 0
-                current_angle = 3
-                self.log_message("✅ EOM approach - angle=3° (good alignment!)", "INFO")
-
-            elif loop_count == 96:
-                # Perfect alignment achieved
-                current_color = 0
-                current_angle = 1
-                self.log_message("✅ EOM approach - angle=1° (excellent alignment)", "INFO")
-
-            elif loop_count == 98:
-                # RED end of maze - now aligned
-                current_color = 73  # All sensors RED (0b01001001)
-                current_angle = 1  # Aligned to <5°
-                self.log_message("🔴 RED END-OF-MAZE detected! Angle=1° (<5° requirement met) - SNC should accept EOM!", "INFO")
-
-            elif loop_count == 99:
-                # Keep RED with perfect alignment
-                current_color = 73
-                current_angle = 0  # Perfect alignment
-                self.log_message("🔴 RED EOM confirmed - angle=0° (perfect) - maze complete!", "INFO")
+            while event_idx < len(self._MAZE_EVENTS) and self._MAZE_EVENTS[event_idx][0] == loop_count:
+                _, current_color, current_angle, message = self._MAZE_EVENTS[event_idx]
+                if message:
+                    self.log_message(message, "INFO")
+                event_idx += 1
 
             # Log progress every 10 loops
             if loop_count % 10 == 0:
@@ -1342,7 +1554,7 @@ class NAVCONTester:
 
     def send_and_wait_response(self, send_packets: List[SCSPacket],
                                send_descriptions: List[str],
-                               wait_for_ist_list: List[int],
+                               wait_for_ist_list: Iterable[int],
                                timeout: float,
                                send_interval: float = 0.5) -> bool:
         """
@@ -1358,85 +1570,130 @@ class NAVCONTester:
         Returns:
             True if expected response received, False on timeout
         """
-        start_time = time.time()
-        last_send_time = 0
+        deadline = time.monotonic() + timeout
+        next_send_time = 0.0
         packet_index = 0
+        send_raw = tuple(encode_packet(packet) for packet in send_packets)  # Encoded once for the rotation
+        wait_for_ist_set = frozenset(wait_for_ist_list)
+        # Only MAZE:SNC packets can match, so reject on the SYS/SUB bits of the raw control
+        # byte before looking at anything else
+        prefix_mask = SYS_MASK | SUB_MASK
+        wanted_prefix = (_MAZE << SYS_SHIFT) | (_SNC << SUB_SHIFT)
+
+        self.log_message(f"🔄 Waiting for SNC MAZE:SNC:{sorted(wait_for_ist_set)}", "INFO")
+
+        while self.test_running:
+            now = time.monotonic()
+            if now >= deadline:
+                break
 
-        self.log_message(f"🔄 Waiting for SNC MAZE:SNC:{wait_for_ist_list}", "INFO")
-
-        while self.test_running and (time.time() - start_time) < timeout:
             # Send packets in rotation
-            if time.time() - last_send_time >= send_interval:
-                self.send_packet(send_packets[packet_index], send_descriptions[packet_index])
-                packet_index = (packet_index + 1) % len(send_packets)
-                last_send_time = time.time()
+            if now >= next_send_time:
+                self._send_raw(send_raw[packet_index], send_descriptions[packet_index])
+                packet_index = (packet_index + 1) % len(send_raw)
+                next_send_time = now + send_interval
 
-            # Check for SNC response
-            try:
-                msg_type, data = self.message_queue.get(timeout=0.1)
+            # Block until SNC responds or the next send is due, then check everything queued
+            for msg_type, data in self.get_messages(min(next_send_time, deadline) - now):
                 if msg_type == 'received_packet':
-                    packet = data
-                    sys_state, subsystem, ist = parse_control_byte(packet.control)
+                    control = data[0]
+                    if (control & prefix_mask) != wanted_prefix:
+                        continue
 
-                    if (sys_state == SystemState.MAZE and
-                        subsystem == SubsystemID.SNC and
-                        ist in wait_for_ist_list):
+                    ist = control & IST_MASK
+                    if ist in wait_for_ist_set:
                         self.log_message(f"✅ Received expected MAZE:SNC:{ist}", "SUCCESS")
                         return True
 
-            except queue.Empty:
-                continue
-
         return False
 
     def monitor_snc_responses(self, timeout=1.0):
         """Monitor SNC responses during test execution"""
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
 
-        while self.test_running and (time.time() - start_time) < timeout:
-            try:
-                msg_type, data = self.message_queue.get(timeout=0.1)
+        while self.test_running:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            for msg_type, data in self.get_messages(deadline - now):
                 if msg_type == 'received_packet':
-                    packet = data
-                    sys_state, subsystem, ist = parse_control_byte(packet.control)
+                    sys_state, subsystem, ist = _CTRL_TABLE[data[0]]
 
                     # Log interesting responses
-                    if subsystem == SubsystemID.SNC:
-                        if sys_state == SystemState.MAZE and ist == 1:
+                    if subsystem is _SNC:
+                        if sys_state is _MAZE and ist == 1:
                             self.log_message("🎯 SNC rotation request detected", "SUCCESS")
-                        elif sys_state == SystemState.MAZE and ist == 3:
+                        elif sys_state is _MAZE and ist == 3:
                             self.log_message("⚡ SNC speed command detected", "SUCCESS")
 
-            except queue.Empty:
-                continue
+    def get_messages(self, timeout: float) -> List[Tuple[str, object]]:
+        """
+        Block up to timeout for one message_queue item, then drain whatever else is queued
 
-    def send_packet(self, packet: SCSPacket, description: str = ""):
-        """Send packet to SNC"""
-        if not self.is_connected or not self.serial_port:
+        Returns:
+            The (msg_type, data) items in arrival order; empty on timeout
+        """
+        message_queue = self.message_queue
+        if not message_queue:
+            # Re-check after clearing: an item appended before the clear would otherwise
+            # have its wakeup lost
+            self._msg_event.clear()
+            if not message_queue:
+                self._msg_event.wait(max(0.0, timeout))
+
+        messages = []
+        while message_queue:
+            messages.append(message_queue.popleft())
+        return messages
+
+    def send_packet(self, packet: Union[SCSPacket, bytes], description: str = ""):
+        """Send packet to SNC (an SCSPacket or its 4 wire bytes, as built by pkt())"""
+        try:
+            raw = encode_packet(packet)
+        except ValueError as e:
+            self.log_message(f"❌ Send error: {str(e)}", "ERROR")
             return
 
-        try:
-            packet_bytes = bytes([packet.control, packet.dat1, packet.dat0, packet.dec])
-            self.serial_port.write(packet_bytes)
+        self._send_raw(raw, description)
 
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            self.test_state['total_packets_sent'] += 1
-            self.test_state['sequence_number'] += 1
+    def _send_raw(self, raw: bytes, description: str = ""):
+        """Send an already-encoded 4-byte packet to SNC"""
+        self.send_batch([(raw, description)])
 
-            # Log the sent packet
-            direction = "SENT"
-            log_line = f"{timestamp} || {self.test_state['sequence_number']:3} || {direction:8} || {packet}"
-            if description:
-                log_line += f" || {description}"
+    def send_batch(self, schedule: List[Tuple[bytes, str]]):
+        """Send (packet bytes, description) pairs to SNC with a single serial write"""
+        if not self.is_connected or not self.serial_port:
+            return
 
-            self.log_message(log_line, "SENT")
+        try:
+            self.serial_port.write(b"".join(packet for packet, _ in schedule))
+            for packet, description in schedule:
+                self.log_sent_packet(packet, description)
 
         except Exception as e:
             self.log_message(f"❌ Send error: {str(e)}", "ERROR")
 
+    def log_sent_packet(self, packet: Union[SCSPacket, bytes], description: str = ""):
+        """Count and log a packet that has been written to the port"""
+        self._sent_count += 1
+        self._seq_num += 1
+
+        # Log the sent packet; the line text is built only if it is displayed or saved.
+        # With verbose_sends off only the counters above are kept, so statistics stay exact
+        if self.verbose_sends:
+            self.log_message(_SentLine(time.time(), self._seq_num, packet, description), "SENT")
+
     def stop_test(self):
         """Stop the current test"""
         self.test_running = False
+        self.stop_event.set()
+
+        # Release any wait_for_* helper blocked on a response, and any message_queue reader
+        with self.response_cv:
+            self.response_cv.notify_all()
+        self.message_queue.append(('test_stopped', None))
+        self._msg_event.set()
 
         self.start_test_btn.config(state='normal' if self.is_connected else 'disabled')
         self.stop_test_btn.config(state='disabled')
@@ -1446,46 +1703,46 @@ class NAVCONTester:
 
         self.log_message("⏹️ Test stopped", "INFO")
 
+    def _periodic_stats_refresh(self):
+        """Refresh the statistics display 5 times a second (GUI thread)"""
+        self.update_statistics()
+        self.root.after(200, self._periodic_stats_refresh)
+
+    def _set_stat(self, key: str, text: str):
+        """Set a statistics label, skipping the Tk call if its text is unchanged"""
+        if self._last_stats.get(key) != text:
+            self._last_stats[key] = text
+            self.stats_labels[key].config(text=text)
+
     def update_statistics(self):
         """Update the statistics display"""
-        if self.test_state['test_start_time']:
-            duration = time.time() - self.test_state['test_start_time']
-            self.stats_labels['test_duration'].config(text=f"{duration:.1f}s")
+        set_stat = self._set_stat
+        if self.test_start_time:
+            duration = time.monotonic() - self.test_start_time
+            set_stat('test_duration', f"{duration:.1f}s")
         else:
-            self.stats_labels['test_duration'].config(text="0.0s")
+            set_stat('test_duration', "0.0s")
 
-        self.stats_labels['packets_sent'].config(text=str(self.test_state['total_packets_sent']))
-        self.stats_labels['packets_received'].config(text=str(self.test_state['total_packets_received']))
+        sent = self._sent_count
+        received = self._rx_count
+        set_stat('packets_sent', str(sent))
+        set_stat('packets_received', str(received))
 
         # Calculate success rate
-        total_packets = self.test_state['total_packets_sent'] + self.test_state['total_packets_received']
-        success_rate = (self.test_state['total_packets_received'] / max(1, self.test_state['total_packets_sent'])) * 100
-        self.stats_labels['success_rate'].config(text=f"{success_rate:.1f}%")
-
-        self.stats_labels['current_state'].config(text=self.test_state['system_state'].name)
-        self.stats_labels['touch_events'].config(text=str(self.test_state['touch_count']))
-        self.stats_labels['rotation_commands'].config(text=str(self.test_state['rotation_count']))
-        self.stats_labels['green_detections'].config(text=str(self.test_state['green_detections']))
-
-    def log_message(self, message: str, msg_type: str = "INFO"):
-        """Log a message to the display"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-
-        # Color coding based on message type
-        color_map = {
-            "SENT": "#3498db",      # Blue
-            "RECEIVED": "#27ae60",  # Green
-            "ERROR": "#e74c3c",     # Red
-            "SUCCESS": "#2ecc71",   # Bright green
-            "INFO": "#ecf0f1"       # Light gray
-        }
-
-        color = color_map.get(msg_type, "#ecf0f1")
-
-        # Insert message with color
-        self.log_text.tag_configure(msg_type, foreground=color)
-        self.log_text.insert(tk.END, f"{message}\n", msg_type)
-        self.log_text.see(tk.END)
+        success_rate = 100.0 * received / sent if sent else 0.0
+        set_stat('success_rate', f"{success_rate:.1f}%")
+
+        set_stat('current_state', self.system_state.name)
+        set_stat('touch_events', str(self._touch_count))
+        set_stat('rotation_commands', str(self._rotation_count))
+        set_stat('green_detections', str(self._green_detections))
+
+    def log_message(self, message: Union[str, _SentLine], msg_type: str = "INFO"):
+        """Log a message to the display (message is converted with str() when shown or saved)"""
+        timestamp = _now_ts()
+
+        # Queue the line; the widget is updated in batches by _flush_log
+        self._log_buf.append((message, msg_type))
 
         # Store in packet log
         self.packet_log.append({
@@ -1494,34 +1751,85 @@ class NAVCONTester:
             'type': msg_type
         })
 
+    def _flush_log(self):
+        """Write all pending log lines to the log widget in a single insert (GUI thread, ~30 Hz)"""
+        # Re-arm first so nothing below (an error, a slow call) can stop the pump
+        self.root.after(33, self._flush_log)
+
+        log_buf = self._log_buf
+        args = []
+        run, run_type = [], None
+        while log_buf:
+            message, msg_type = log_buf.popleft()
+            if msg_type != run_type and run:
+                args += ("".join(run), run_type)
+                run = []
+            run.append(f"{message}\n")
+            run_type = msg_type
+        if run:
+            args += ("".join(run), run_type)
+
+        # Text.insert takes alternating (text, tags) pairs, one per run of same-type lines,
+        # so a single call keeps every line's colour
+        if args:
+            self.log_text.insert(tk.END, *args)
+            self.log_text.see(tk.END)
+
+        # Each queued call runs as its own idle callback, so a modal dialog (save_log's
+        # message boxes) or an exception in one doesn't hold up the log pump
+        gui_calls = self._gui_calls
+        while gui_calls:
+            self.root.after_idle(gui_calls.popleft())
+
     def clear_log(self):
         """Clear the packet log"""
+        self._log_buf.clear()
         self.log_text.delete(1.0, tk.END)
         self.packet_log.clear()
+        self.rx_raw_log.clear()
         self.log_message("🗑️ Log cleared", "INFO")
 
     def save_log(self):
-        """Save the packet log to file"""
+        """Save the packet log to file (written on a worker thread so the GUI doesn't stall)"""
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"navcon_test_log_{stamp}.txt"
+        filepath = os.path.join(log_directory(), filename)
+        raw_filename = f"navcon_rx_raw_{stamp}.bin"
+        scenario_name = self.current_scenario.name if self.current_scenario else 'None'
+
+        # Snapshot on the GUI thread; the RX thread keeps appending while the worker writes
+        entries = list(self.packet_log)
+        rx_raw = bytes(self.rx_raw_log)
+
+        threading.Thread(target=self._write_log_files,
+                         args=(filepath, filename, raw_filename, scenario_name, entries, rx_raw),
+                         daemon=True).start()
+
+    def _write_log_files(self, filepath: str, filename: str, raw_filename: str,
+                         scenario_name: str, entries: List[dict], rx_raw: bytes):
+        """Write a save_log snapshot to disk (worker thread)"""
         try:
-            filename = f"navcon_test_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-            filepath = f"C:\\Users\\byron\\OneDrive\\Documents\\3rd Year Uni\\Sem 2\\ERD320\\Phase3\\Phase3\\NAVCON_Test_Suite\\{filename}"
-
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
                 f.write("MARV NAVCON Test Log\n")
                 f.write("=" * 50 + "\n")
                 f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Scenario: {self.current_scenario.name if self.current_scenario else 'None'}\n")
+                f.write(f"Scenario: {scenario_name}\n")
                 f.write("=" * 50 + "\n\n")
 
-                for entry in self.packet_log:
-                    f.write(f"[{entry['timestamp']}] [{entry['type']}] {entry['message']}\n")
+                f.writelines(f"[{entry['timestamp']}] [{entry['type']}] {entry['message']}\n" for entry in entries)
+
+            # Raw received packets as back-to-back 4-byte records, written in one call
+            with open(os.path.join(os.path.dirname(filepath), raw_filename), 'wb') as f:
+                f.write(rx_raw)
 
-            self.log_message(f"💾 Log saved to {filename}", "SUCCESS")
-            messagebox.showinfo("Success", f"Log saved to {filename}")
+            self.log_message(f"💾 Log saved to {filename} (raw RX: {raw_filename})", "SUCCESS")
+            self._gui_calls.append(lambda: messagebox.showinfo(
+                "Success", f"Log saved to {filename}\nRaw RX packets saved to {raw_filename}"))
 
         except Exception as e:
-            self.log_message(f"❌ Save error: {str(e)}", "ERROR")
-            messagebox.showerror("Error", f"Failed to save log: {str(e)}")
+            error = str(e)
+            self.log_message(f"❌ Save error: {error}", "ERROR")
+            self._gui_calls.append(lambda: messagebox.showerror("Error", f"Failed to save log: {error}"))
 
     def run(self):
         """Start the application"""